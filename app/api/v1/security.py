@@ -1,26 +1,56 @@
 """
 API routes for security testing endpoints.
 """
+from itertools import islice
+from typing import Iterator, List
+
+import orjson
 from fastapi import APIRouter, UploadFile, File, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.models.security import ScanResponse, ErrorResponse
-from app.services.security_service import process_zip_file
+from app.services.security_service import iter_vulnerabilities, list_zip_files
 
 # Create router
 router = APIRouter(prefix="/api/v1")
 
+# Number of vulnerabilities serialized per streamed chunk
+_STREAM_BATCH_SIZE = 256
+
+
+def _stream_scan_response(file_names: List[str]) -> Iterator[bytes]:
+    """
+    Serialize scan results incrementally as a ScanResponse JSON document.
+    
+    Args:
+        file_names: Names of the files in the scanned archive
+        
+    Yields:
+        Chunks of the JSON response body
+    """
+    vulnerabilities = iter_vulnerabilities(file_names)
+    
+    yield b'{"status":"success","file_count":%d,"vulnerabilities":[' % len(file_names)
+    
+    separator = b""
+    while batch := list(islice(vulnerabilities, _STREAM_BATCH_SIZE)):
+        # Serialize the batch as a JSON array and drop its brackets
+        yield separator + orjson.dumps(batch)[1:-1]
+        separator = b","
+    
+    yield b"]}"
+
 
 @router.post(
     "/security-testing",
-    response_model=ScanResponse,
     responses={
         200: {"model": ScanResponse, "description": "Security scan completed successfully"},
         400: {"model": ErrorResponse, "description": "Bad request or invalid file"},
         500: {"model": ErrorResponse, "description": "Internal server error"}
     },
     summary="Run Security Test on ZIP File",
-    description="Accepts a ZIP file upload, extracts files, and returns mock vulnerability scan results."
+    description="Accepts a ZIP file upload, reads the file names from the ZIP (nothing is extracted), and returns mock vulnerability scan results."
 )
 async def security_testing(file: UploadFile = File(...)):
     """
@@ -40,13 +70,15 @@ async def security_testing(file: UploadFile = File(...)):
                 content={"status": "error", "message": "Only ZIP files are supported"}
             )
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Process the ZIP file
-        scan_results = process_zip_file(file_content)
+        # Read the file list from the underlying spooled file in a worker
+        # thread so the upload is never copied into a single bytes object
+        file_names = await run_in_threadpool(list_zip_files, file.file)
         
-        return scan_results
+        # Stream results as they are generated instead of building them first
+        return StreamingResponse(
+            _stream_scan_response(file_names),
+            media_type="application/json"
+        )
     except ValueError as e:
         # Handle validation errors
         return JSONResponse(
@@ -2,271 +2,449 @@
 Service layer for security testing functionality.
 """
 import os
-import tempfile
+import struct
 import zipfile
-import random
 from datetime import date, timedelta
-from typing import List, Dict, Any
+from typing import BinaryIO, Iterator, List, Dict, Any, Optional, Tuple
 
-from app.models.security import VulnerabilityDetail
+import numpy as np
 
 
-def process_zip_file(file_content: bytes) -> Dict[str, Any]:
+# Vulnerability templates by file extension, built once at import time
+_TEMPLATES_BY_EXT: Dict[str, Tuple[Dict[str, Any], ...]] = {
+    ".py": (
+        {
+            "name": "Hardcoded Password",
+            "severity": "High",
+            "impact": "Credentials may be exposed in source code",
+            "cvssScore": 7.4,
+            "description": "The application contains hardcoded credentials in source code.",
+            "recommendation": "Use environment variables or a secure vault for storing credentials.",
+            "codeSnippet": "password = 'admin123'  # Hardcoded password",
+            "fix": "password = os.environ.get('PASSWORD')"
+        },
+        {
+            "name": "SQL Injection Vulnerability",
+            "severity": "Critical",
+            "impact": "Attackers may execute arbitrary SQL commands",
+            "cvssScore": 9.1,
+            "description": "User input is directly concatenated into SQL queries without proper sanitization.",
+            "recommendation": "Use parameterized queries or an ORM to prevent SQL injection.",
+            "codeSnippet": "query = f\"SELECT * FROM users WHERE username = '{username}'\"",
+            "fix": "query = \"SELECT * FROM users WHERE username = %s\"\ncursor.execute(query, (username,))"
+        },
+        {
+            "name": "Insecure Random Number Generation",
+            "severity": "Medium",
+            "impact": "Predictable random values may lead to security vulnerabilities",
+            "cvssScore": 5.9,
+            "description": "The application uses Python's random module for security-sensitive operations.",
+            "recommendation": "Use secrets module for cryptographic operations instead of random.",
+            "codeSnippet": "token = ''.join(random.choice(chars) for _ in range(length))",
+            "fix": "import secrets\ntoken = ''.join(secrets.choice(chars) for _ in range(length))"
+        },
+    ),
+    ".js": (
+        {
+            "name": "Cross-site Scripting (XSS) Vulnerability",
+            "severity": "High",
+            "impact": "Attackers may inject malicious scripts affecting other users",
+            "cvssScore": 7.8,
+            "description": "Unescaped user input in HTML context allows JavaScript injection.",
+            "recommendation": "Use output encoding or sanitization libraries (like DOMPurify).",
+            "codeSnippet": "element.innerHTML = userInput;",
+            "fix": "import DOMPurify from 'dompurify';\nelement.innerHTML = DOMPurify.sanitize(userInput);"
+        },
+        {
+            "name": "Insecure Use of eval()",
+            "severity": "Critical",
+            "impact": "Attackers may execute arbitrary code",
+            "cvssScore": 9.6,
+            "description": "The application uses eval() with user-controlled input.",
+            "recommendation": "Avoid using eval() entirely. Use safer alternatives like JSON.parse() for JSON data.",
+            "codeSnippet": "const result = eval(userInput);",
+            "fix": "const result = JSON.parse(userInput);"
+        },
+        {
+            "name": "Weak Cryptographic Algorithm",
+            "severity": "Medium",
+            "impact": "Encrypted data may be compromised",
+            "cvssScore": 5.3,
+            "description": "The application uses MD5 for password hashing, which is cryptographically broken.",
+            "recommendation": "Use modern hashing algorithms like bcrypt, scrypt, or Argon2 for password storage.",
+            "codeSnippet": "const hash = crypto.createHash('md5').update(password).digest('hex');",
+            "fix": "const hash = await bcrypt.hash(password, 12);"
+        },
+    ),
+    ".java": (
+        {
+            "name": "Insecure Deserialization",
+            "severity": "Critical",
+            "impact": "Remote code execution",
+            "cvssScore": 8.8,
+            "description": "The application deserializes untrusted data without proper validation.",
+            "recommendation": "Implement integrity checks or use safer alternatives like JSON.",
+            "codeSnippet": "ObjectInputStream in = new ObjectInputStream(inputStream);\nObject obj = in.readObject();",
+            "fix": "// Use JSON instead\nObjectMapper mapper = new ObjectMapper();\nMyObject obj = mapper.readValue(jsonString, MyObject.class);"
+        },
+        {
+            "name": "Path Traversal Vulnerability",
+            "severity": "High",
+            "impact": "Unauthorized access to files outside intended directory",
+            "cvssScore": 7.5,
+            "description": "User input is used in file paths without proper validation.",
+            "recommendation": "Validate and sanitize file paths, use Path.normalize() and check against allowed directories.",
+            "codeSnippet": "File file = new File(basePath + userInput);",
+            "fix": "Path path = Paths.get(basePath, userInput).normalize();\nif (!path.startsWith(Paths.get(basePath))) {\n    throw new SecurityException(\"Path traversal attempt\");\n}"
+        },
+    ),
+    ".php": (
+        {
+            "name": "Remote File Inclusion",
+            "severity": "Critical",
+            "impact": "Remote code execution",
+            "cvssScore": 9.3,
+            "description": "The application includes files based on user input without proper validation.",
+            "recommendation": "Use whitelisting for included files and disable allow_url_include in php.ini.",
+            "codeSnippet": "include($_GET['page'] . '.php');",
+            "fix": "$allowed_pages = ['home', 'about', 'contact'];\nif (in_array($_GET['page'], $allowed_pages)) {\n    include($_GET['page'] . '.php');\n}"
+        },
+        {
+            "name": "SQL Injection in PHP",
+            "severity": "Critical",
+            "impact": "Database compromise",
+            "cvssScore": 9.1,
+            "description": "User input is directly inserted into SQL queries.",
+            "recommendation": "Use prepared statements with PDO or mysqli_prepare().",
+            "codeSnippet": "$query = \"SELECT * FROM users WHERE username = '$username'\";",
+            "fix": "$stmt = $pdo->prepare(\"SELECT * FROM users WHERE username = ?\");\n$stmt->execute([$username]);"
+        },
+    ),
+    ".html": (
+        {
+            "name": "Cross-site Scripting in HTML",
+            "severity": "High",
+            "impact": "Session hijacking, defacement",
+            "cvssScore": 7.4,
+            "description": "Unescaped data is inserted into HTML without proper encoding.",
+            "recommendation": "Use templating engines with automatic escaping or manually escape HTML special characters.",
+            "codeSnippet": "<div id=\"message\"></div>\n<script>document.getElementById('message').innerHTML = getParameterByName('msg');</script>",
+            "fix": "<div id=\"message\"></div>\n<script>\nfunction escapeHTML(str) {\n    return str.replace(/[&<>\"']/g, (m) => {\n        return {'&':'&amp;','<':'&lt;','>':'&gt;','\"':'&quot;',\"'\":'&#39;'}[m];\n    });\n}\ndocument.getElementById('message').innerHTML = escapeHTML(getParameterByName('msg'));\n</script>"
+        },
+    ),
+    ".json": (
+        {
+            "name": "Sensitive Data Exposure",
+            "severity": "High",
+            "impact": "Credential leakage",
+            "cvssScore": 7.5,
+            "description": "The JSON file contains sensitive information like API keys or passwords.",
+            "recommendation": "Store sensitive data in environment variables or secure vaults, not in JSON configuration files.",
+            "codeSnippet": "{\n  \"api_key\": \"api_key_example_12345\",\n  \"database\": {\n    \"password\": \"db_password_123\"\n  }\n}",
+            "fix": "{\n  \"api_key\": \"${API_KEY}\",\n  \"database\": {\n    \"password\": \"${DB_PASSWORD}\"\n  }\n}"
+        },
+    ),
+}
+
+# Extensions that have at least one vulnerability template
+_EXT_KEYS = frozenset(_TEMPLATES_BY_EXT)
+
+# Upper bounds used to size the batched random draws
+_MAX_VULNERABILITIES_PER_FILE = 2
+_MAX_TEMPLATES_PER_EXT = max(len(templates) for templates in _TEMPLATES_BY_EXT.values())
+
+# Every "start-end" line range a mock vulnerability can report: a start line
+# of 1-50 spanning 1-10 lines
+_LINE_RANGES = tuple(
+    f"{start_line}-{start_line + span}"
+    for start_line in range(1, 51)
+    for span in range(1, 11)
+)
+
+# ZIP record layouts (PKWARE APPNOTE): the end of central directory record
+# and the central directory file header
+_EOCD = struct.Struct("<4s4H2LH")
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_LOCATOR_SIZE = 20
+_MAX_ZIP_COMMENT_SIZE = 0xFFFF
+_UTF8_NAME_FLAG = 0x800
+
+_INVALID_ZIP_MESSAGE = "The uploaded file is not a valid ZIP file"
+
+# Shared random generator, with its draw methods bound once
+_rng = np.random.default_rng()
+_random = _rng.random
+_integers = _rng.integers
+
+# Pool of mock CVE identifiers: 512 distinct numbers for each year 2020-2023
+_CVE_POOL = tuple(
+    f"CVE-{year}-{number}"
+    for year in range(2020, 2024)
+    for number in _rng.choice(np.arange(1000, 100000), 512, replace=False).tolist()
+)
+
+
+def list_zip_files(zip_file: BinaryIO) -> List[str]:
     """
-    Process a ZIP file and generate mock vulnerability scan results.
+    List the names of the files in a ZIP archive.
     
     Args:
-        file_content: Content of the uploaded ZIP file
+        zip_file: Seekable binary file object holding the uploaded ZIP file
         
     Returns:
-        Dictionary with mock vulnerability scan results
+        Names of all non-directory entries in the archive
         
     Raises:
-        Exception: If the file is not a valid ZIP file
+        ValueError: If the file is not a valid ZIP file
     """
-    # Create a temporary directory to extract files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create a temporary file to save the uploaded content
-        temp_zip_path = os.path.join(temp_dir, "uploaded.zip")
-        
-        # Write the content to the temporary file
-        with open(temp_zip_path, "wb") as temp_file:
-            temp_file.write(file_content)
-        
-        # Check if the file is a valid ZIP file
-        if not zipfile.is_zipfile(temp_zip_path):
-            raise ValueError("The uploaded file is not a valid ZIP file")
+    # Only the file names are needed, so read them from the central directory
+    names = _read_central_directory_names(zip_file)
+    
+    # Anything the fast path cannot handle (ZIP64, multi-disk, damaged or
+    # unusual layouts) is left to zipfile, which decides whether it is valid
+    if names is None:
+        zip_file.seek(0)
+        try:
+            with zipfile.ZipFile(zip_file, "r") as zip_ref:
+                names = zip_ref.namelist()
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"{_INVALID_ZIP_MESSAGE}: {e}") from e
+    
+    # Skip directories
+    return [name for name in names if not name.endswith("/")]
+
+
+def _read_central_directory_names(zip_file: BinaryIO) -> Optional[List[str]]:
+    """
+    Read entry names straight from a ZIP archive's central directory.
+    
+    This skips building a ZipInfo object per entry, which zipfile does even
+    when only the names are used.
+    
+    Args:
+        zip_file: Seekable binary file object holding the ZIP archive
         
-        # Extract the ZIP file
-        with zipfile.ZipFile(temp_zip_path, "r") as zip_ref:
-            # Get the list of files in the ZIP
-            file_list = zip_ref.namelist()
+    Returns:
+        Entry names in archive order, or None if the archive is not a plain
+        single-disk, non-ZIP64 archive this parser can read
+    """
+    # The end of central directory record sits near the end of the file,
+    # followed by an archive comment and possibly trailing bytes. The tail
+    # also covers the ZIP64 locator that may precede the record.
+    size = zip_file.seek(0, os.SEEK_END)
+    tail_start = max(0, size - _EOCD.size - _MAX_ZIP_COMMENT_SIZE - _ZIP64_LOCATOR_SIZE)
+    zip_file.seek(tail_start)
+    tail = zip_file.read()
+    
+    # Take the last record whose comment fits inside the file, skipping
+    # signature bytes that occur inside the comment
+    last_start = len(tail) - _EOCD.size
+    eocd_pos = tail.rfind(_EOCD_SIGNATURE, 0, last_start + len(_EOCD_SIGNATURE))
+    while eocd_pos >= 0:
+        record = _EOCD.unpack_from(tail, eocd_pos)
+        if eocd_pos + _EOCD.size + record[-1] <= len(tail):
+            break
+        eocd_pos = tail.rfind(_EOCD_SIGNATURE, 0, eocd_pos)
+    else:
+        return None
+    
+    _, disk, directory_disk, _, entry_count, directory_size, directory_offset, _ = record
+    
+    # ZIP64 archives keep the real values in a separate record, which some
+    # writers emit even when the values would fit
+    locator_pos = eocd_pos - _ZIP64_LOCATOR_SIZE
+    if (
+        entry_count == 0xFFFF
+        or 0xFFFFFFFF in (directory_size, directory_offset)
+        or (locator_pos >= 0 and tail.startswith(_ZIP64_LOCATOR_SIGNATURE, locator_pos))
+    ):
+        return None
+    
+    if disk or directory_disk:
+        return None
+    
+    # The central directory ends where the end record starts; locating it
+    # from there also copes with data prepended to the archive
+    directory_start = tail_start + eocd_pos - directory_size
+    if directory_start < 0:
+        return None
+    zip_file.seek(directory_start)
+    directory = zip_file.read(directory_size)
+    view = memoryview(directory)
+    
+    names = []
+    pos = 0
+    try:
+        for _ in range(entry_count):
+            header = _CENTRAL_HEADER.unpack_from(directory, pos)
+            if header[0] != _CENTRAL_HEADER_SIGNATURE:
+                return None
+            
+            flags = header[3]
+            name_length, extra_length, comment_length = header[10:13]
+            name_start = pos + _CENTRAL_HEADER.size
+            
+            # Names are UTF-8 when flagged, otherwise legacy CP437
+            encoding = "utf-8" if flags & _UTF8_NAME_FLAG else "cp437"
+            name = str(view[name_start:name_start + name_length], encoding)
             
-            # Extract all files
-            zip_ref.extractall(temp_dir)
+            # zipfile cuts names at the first NUL byte; do the same
+            if "\x00" in name:
+                name = name[:name.index("\x00")]
+            names.append(name)
             
-            # Generate mock vulnerability results for each file
-            vulnerabilities = []
-            for file_name in file_list:
-                # Skip directories
-                if file_name.endswith("/"):
-                    continue
-                
-                # Generate detailed mock vulnerabilities based on file extension
-                file_vulnerabilities = generate_detailed_vulnerabilities(file_name)
-                
-                # Add to vulnerabilities list
-                vulnerabilities.extend(file_vulnerabilities)
+            pos = name_start + name_length + extra_length + comment_length
+    except (struct.error, UnicodeDecodeError):
+        return None
     
-    # Return mock scan results
-    return {
-        "status": "success",
-        "file_count": len(file_list) - sum(1 for f in file_list if f.endswith("/")),
-        "vulnerabilities": vulnerabilities
-    }
+    return names
 
 
-def generate_detailed_vulnerabilities(file_name: str) -> List[VulnerabilityDetail]:
+def iter_vulnerabilities(file_names: List[str]) -> Iterator[Dict[str, Any]]:
     """
-    Generate detailed mock vulnerabilities based on file extension.
+    Generate mock vulnerabilities for a list of files, one record at a time.
+    
+    Args:
+        file_names: Names of the files in the scanned archive
+        
+    Yields:
+        Detailed vulnerability records
+    """
+    # Draw all random values for the scan in one batch
+    draws = _draw_random_values(len(file_names))
+    
+    for index, file_name in enumerate(file_names):
+        # Skip files whose extension has no templates before any other work
+        ext = _get_ext(file_name)
+        if ext not in _EXT_KEYS:
+            continue
+        
+        # Generate detailed mock vulnerabilities based on file extension
+        yield from generate_detailed_vulnerabilities(
+            file_name, _TEMPLATES_BY_EXT[ext], draws, index
+        )
+
+
+def _get_ext(file_name: str) -> str:
+    """
+    Get the lower-cased extension of a ZIP entry name.
+    
+    Equivalent to os.path.splitext for "/"-separated names, but only the
+    trailing extension is sliced and lower-cased.
     
     Args:
         file_name: Name of the file
         
     Returns:
-        List of detailed vulnerability objects
+        Extension including the leading dot, or an empty string
     """
-    # Define vulnerability templates by file type
-    vulnerability_templates = {
-        ".py": [
-            {
-                "name": "Hardcoded Password",
-                "severity": "High",
-                "impact": "Credentials may be exposed in source code",
-                "cvssScore": 7.4,
-                "description": "The application contains hardcoded credentials in source code.",
-                "recommendation": "Use environment variables or a secure vault for storing credentials.",
-                "codeSnippet": "password = 'admin123'  # Hardcoded password",
-                "fix": "password = os.environ.get('PASSWORD')"
-            },
-            {
-                "name": "SQL Injection Vulnerability",
-                "severity": "Critical",
-                "impact": "Attackers may execute arbitrary SQL commands",
-                "cvssScore": 9.1,
-                "description": "User input is directly concatenated into SQL queries without proper sanitization.",
-                "recommendation": "Use parameterized queries or an ORM to prevent SQL injection.",
-                "codeSnippet": "query = f\"SELECT * FROM users WHERE username = '{username}'\"",
-                "fix": "query = \"SELECT * FROM users WHERE username = %s\"\ncursor.execute(query, (username,))"
-            },
-            {
-                "name": "Insecure Random Number Generation",
-                "severity": "Medium",
-                "impact": "Predictable random values may lead to security vulnerabilities",
-                "cvssScore": 5.9,
-                "description": "The application uses Python's random module for security-sensitive operations.",
-                "recommendation": "Use secrets module for cryptographic operations instead of random.",
-                "codeSnippet": "token = ''.join(random.choice(chars) for _ in range(length))",
-                "fix": "import secrets\ntoken = ''.join(secrets.choice(chars) for _ in range(length))"
-            }
-        ],
-        ".js": [
-            {
-                "name": "Cross-site Scripting (XSS) Vulnerability",
-                "severity": "High",
-                "impact": "Attackers may inject malicious scripts affecting other users",
-                "cvssScore": 7.8,
-                "description": "Unescaped user input in HTML context allows JavaScript injection.",
-                "recommendation": "Use output encoding or sanitization libraries (like DOMPurify).",
-                "codeSnippet": "element.innerHTML = userInput;",
-                "fix": "import DOMPurify from 'dompurify';\nelement.innerHTML = DOMPurify.sanitize(userInput);"
-            },
-            {
-                "name": "Insecure Use of eval()",
-                "severity": "Critical",
-                "impact": "Attackers may execute arbitrary code",
-                "cvssScore": 9.6,
-                "description": "The application uses eval() with user-controlled input.",
-                "recommendation": "Avoid using eval() entirely. Use safer alternatives like JSON.parse() for JSON data.",
-                "codeSnippet": "const result = eval(userInput);",
-                "fix": "const result = JSON.parse(userInput);"
-            },
-            {
-                "name": "Weak Cryptographic Algorithm",
-                "severity": "Medium",
-                "impact": "Encrypted data may be compromised",
-                "cvssScore": 5.3,
-                "description": "The application uses MD5 for password hashing, which is cryptographically broken.",
-                "recommendation": "Use modern hashing algorithms like bcrypt, scrypt, or Argon2 for password storage.",
-                "codeSnippet": "const hash = crypto.createHash('md5').update(password).digest('hex');",
-                "fix": "const hash = await bcrypt.hash(password, 12);"
-            }
-        ],
-        ".java": [
-            {
-                "name": "Insecure Deserialization",
-                "severity": "Critical",
-                "impact": "Remote code execution",
-                "cvssScore": 8.8,
-                "description": "The application deserializes untrusted data without proper validation.",
-                "recommendation": "Implement integrity checks or use safer alternatives like JSON.",
-                "codeSnippet": "ObjectInputStream in = new ObjectInputStream(inputStream);\nObject obj = in.readObject();",
-                "fix": "// Use JSON instead\nObjectMapper mapper = new ObjectMapper();\nMyObject obj = mapper.readValue(jsonString, MyObject.class);"
-            },
-            {
-                "name": "Path Traversal Vulnerability",
-                "severity": "High",
-                "impact": "Unauthorized access to files outside intended directory",
-                "cvssScore": 7.5,
-                "description": "User input is used in file paths without proper validation.",
-                "recommendation": "Validate and sanitize file paths, use Path.normalize() and check against allowed directories.",
-                "codeSnippet": "File file = new File(basePath + userInput);",
-                "fix": "Path path = Paths.get(basePath, userInput).normalize();\nif (!path.startsWith(Paths.get(basePath))) {\n    throw new SecurityException(\"Path traversal attempt\");\n}"
-            }
-        ],
-        ".php": [
-            {
-                "name": "Remote File Inclusion",
-                "severity": "Critical",
-                "impact": "Remote code execution",
-                "cvssScore": 9.3,
-                "description": "The application includes files based on user input without proper validation.",
-                "recommendation": "Use whitelisting for included files and disable allow_url_include in php.ini.",
-                "codeSnippet": "include($_GET['page'] . '.php');",
-                "fix": "$allowed_pages = ['home', 'about', 'contact'];\nif (in_array($_GET['page'], $allowed_pages)) {\n    include($_GET['page'] . '.php');\n}"
-            },
-            {
-                "name": "SQL Injection in PHP",
-                "severity": "Critical",
-                "impact": "Database compromise",
-                "cvssScore": 9.1,
-                "description": "User input is directly inserted into SQL queries.",
-                "recommendation": "Use prepared statements with PDO or mysqli_prepare().",
-                "codeSnippet": "$query = \"SELECT * FROM users WHERE username = '$username'\";",
-                "fix": "$stmt = $pdo->prepare(\"SELECT * FROM users WHERE username = ?\");\n$stmt->execute([$username]);"
-            }
-        ],
-        ".html": [
-            {
-                "name": "Cross-site Scripting in HTML",
-                "severity": "High",
-                "impact": "Session hijacking, defacement",
-                "cvssScore": 7.4,
-                "description": "Unescaped data is inserted into HTML without proper encoding.",
-                "recommendation": "Use templating engines with automatic escaping or manually escape HTML special characters.",
-                "codeSnippet": "<div id=\"message\"></div>\n<script>document.getElementById('message').innerHTML = getParameterByName('msg');</script>",
-                "fix": "<div id=\"message\"></div>\n<script>\nfunction escapeHTML(str) {\n    return str.replace(/[&<>\"']/g, (m) => {\n        return {'&':'&amp;','<':'&lt;','>':'&gt;','\"':'&quot;',\"'\":'&#39;'}[m];\n    });\n}\ndocument.getElementById('message').innerHTML = escapeHTML(getParameterByName('msg'));\n</script>"
-            }
-        ],
-        ".json": [
-            {
-                "name": "Sensitive Data Exposure",
-                "severity": "High",
-                "impact": "Credential leakage",
-                "cvssScore": 7.5,
-                "description": "The JSON file contains sensitive information like API keys or passwords.",
-                "recommendation": "Store sensitive data in environment variables or secure vaults, not in JSON configuration files.",
-                "codeSnippet": "{\n  \"api_key\": \"api_key_example_12345\",\n  \"database\": {\n    \"password\": \"db_password_123\"\n  }\n}",
-                "fix": "{\n  \"api_key\": \"${API_KEY}\",\n  \"database\": {\n    \"password\": \"${DB_PASSWORD}\"\n  }\n}"
-            }
-        ]
-    }
+    dot = file_name.rfind(".")
+    base_start = file_name.rfind("/") + 1
     
-    # Get file extension
-    _, ext = os.path.splitext(file_name.lower())
+    # Ignore dots in directory names and the leading dots of hidden files
+    if dot <= base_start or file_name.count(".", base_start, dot) == dot - base_start:
+        return ""
     
-    # Get vulnerability templates for this file type
-    templates = vulnerability_templates.get(ext, [])
+    return file_name[dot:].lower()
+
+
+def _draw_random_values(n_files: int) -> Dict[str, List[Any]]:
+    """
+    Draw every random value needed to generate mock results for a scan.
     
-    # If no templates for this extension, return empty list
-    if not templates:
-        return []
+    Values are drawn as NumPy arrays in one call per kind and converted to
+    lists, so the per-file loop only does list indexing.
     
+    Args:
+        n_files: Number of files in the scan
+        
+    Returns:
+        Dictionary of per-file and per-vulnerability-slot random values
+    """
+    n_slots = n_files * _MAX_VULNERABILITIES_PER_FILE
+    
+    return {
+        # Per-file values
+        "has_vulnerabilities": _random(n_files).tolist(),
+        "count": _random(n_files).tolist(),
+        "order": _random((n_files, _MAX_TEMPLATES_PER_EXT)).argsort(axis=1).tolist(),
+        # Per-vulnerability-slot values
+        "line_range": _integers(0, len(_LINE_RANGES), n_slots).tolist(),
+        "exploitable": _integers(0, 2, n_slots, dtype=bool).tolist(),
+        "has_cve": _random(n_slots).tolist(),
+        "cve": _integers(0, len(_CVE_POOL), n_slots).tolist(),
+    }
+
+
+def generate_detailed_vulnerabilities(
+    file_name: str,
+    templates: Tuple[Dict[str, Any], ...],
+    draws: Dict[str, List[Any]],
+    index: int
+) -> List[Dict[str, Any]]:
+    """
+    Generate detailed mock vulnerabilities from a file's templates.
+    
+    Records are plain dicts with the VulnerabilityDetail fields; the inputs
+    come from static templates, so model validation is skipped.
+    
+    Args:
+        file_name: Name of the file
+        templates: Vulnerability templates for the file's extension
+        draws: Batched random values from _draw_random_values
+        index: Position of the file within the batch
+        
+    Returns:
+        List of detailed vulnerability records
+    """
     # Randomly decide if the file has vulnerabilities (70% chance)
-    if random.random() < 0.7:
+    if draws["has_vulnerabilities"][index] < 0.7:
         # Select a random number of vulnerabilities (0-2)
-        num_vulnerabilities = random.randint(0, min(2, len(templates)))
+        max_vulnerabilities = min(_MAX_VULNERABILITIES_PER_FILE, len(templates))
+        num_vulnerabilities = int(draws["count"][index] * (max_vulnerabilities + 1))
         
         # If no vulnerabilities, return empty list
         if num_vulnerabilities == 0:
             return []
         
-        # Randomly select vulnerability templates
-        selected_templates = random.sample(templates, num_vulnerabilities)
+        # Randomly select vulnerability templates from a shuffled index order
+        selected_templates = [
+            templates[i] for i in draws["order"][index] if i < len(templates)
+        ][:num_vulnerabilities]
         
         # Generate detailed vulnerabilities
         vulnerabilities = []
-        for template in selected_templates:
-            # Generate random line numbers
-            start_line = random.randint(1, 50)
-            end_line = start_line + random.randint(1, 10)
-            lines = f"{start_line}-{end_line}"
+        first_slot = index * _MAX_VULNERABILITIES_PER_FILE
+        for slot, template in enumerate(selected_templates, first_slot):
+            # Pick random line numbers
+            lines = _LINE_RANGES[draws["line_range"][slot]]
             
             # Randomly decide if it's exploitable
-            exploitable = random.choice([True, False])
+            exploitable = draws["exploitable"][slot]
             
             # Randomly decide if it has a CVE
             cve = None
-            if random.random() < 0.3:  # 30% chance to have a CVE
-                year = random.randint(2020, 2023)
-                number = random.randint(1000, 99999)
-                cve = f"CVE-{year}-{number}"
+            if draws["has_cve"][slot] < 0.3:  # 30% chance to have a CVE
+                cve = _CVE_POOL[draws["cve"][slot]]
             
             # Create vulnerability detail
-            vulnerability = VulnerabilityDetail(
-                name=template["name"],
-                file=file_name,
-                lines=lines,
-                severity=template["severity"],
-                impact=template["impact"],
-                exploitable=exploitable,
-                cvssScore=template["cvssScore"],
-                description=template["description"],
-                cve=cve,
-                recommendation=template["recommendation"],
-                codeSnippet=template["codeSnippet"],
-                fix=template["fix"]
-            )
+            vulnerability = {
+                "name": template["name"],
+                "file": file_name,
+                "lines": lines,
+                "severity": template["severity"],
+                "impact": template["impact"],
+                "exploitable": exploitable,
+                "cvssScore": template["cvssScore"],
+                "description": template["description"],
+                "cve": cve,
+                "recommendation": template["recommendation"],
+                "codeSnippet": template["codeSnippet"],
+                "fix": template["fix"]
+            }
             
             vulnerabilities.append(vulnerability)
         
@@ -1,20 +1,50 @@
 """
 JWT token handling utilities.
 """
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timezone
+from functools import partial
 from typing import Optional, Dict, Any
 
-from jose import jwt, JWTError
+import jwt
+from cachetools import TTLCache
+from jwt import InvalidTokenError
 from fastapi import HTTPException, status
 
 from config import (
-    SECRET_KEY,
+    SECRET_KEY_BYTES,
     ALGORITHM,
-    ACCESS_TOKEN_EXPIRE_MINUTES,
-    REFRESH_TOKEN_EXPIRE_MINUTES,
+    ACCESS_TOKEN_EXPIRE,
+    REFRESH_TOKEN_EXPIRE,
     TOKEN_TYPE
 )
 
+# Challenge header sent with every 401 response
+_AUTH_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+# Current time in UTC
+_utcnow = partial(datetime.now, timezone.utc)
+
+# Payloads of already-verified tokens, keyed by the raw token string
+_payload_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def unauthorized(detail: str) -> HTTPException:
+    """
+    Build a 401 Unauthorized exception with the Bearer challenge header.
+    
+    Args:
+        detail: Error message for the response
+        
+    Returns:
+        HTTPException ready to be raised
+    """
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers=_AUTH_HEADERS,
+    )
+
 
 def create_access_token(data: Dict[str, Any]) -> str:
     """
@@ -27,13 +57,13 @@ def create_access_token(data: Dict[str, Any]) -> str:
         Encoded JWT access token
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = _utcnow() + ACCESS_TOKEN_EXPIRE
     
-    # Add expiration time and token type to payload
-    to_encode.update({"exp": expire, "type": "access"})
+    # Add expiration time (as a Unix timestamp) and token type to payload
+    to_encode.update({"exp": int(expire.timestamp()), "type": "access"})
     
     # Create the JWT token
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -48,13 +78,13 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
         Encoded JWT refresh token
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES)
+    expire = _utcnow() + REFRESH_TOKEN_EXPIRE
     
-    # Add expiration time and token type to payload
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # Add expiration time (as a Unix timestamp) and token type to payload
+    to_encode.update({"exp": int(expire.timestamp()), "type": "refresh"})
     
     # Create the JWT token
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -62,6 +92,9 @@ def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and validate a JWT token.
     
+    Verified payloads are cached briefly so repeated requests with the same
+    token skip signature verification.
+    
     Args:
         token: JWT token to decode
         
@@ -71,15 +104,21 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    payload = _payload_cache.get(token)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+        
+        # Token expired since it was cached; let jwt.decode reject it
+        _payload_cache.pop(token, None)
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
+    except InvalidTokenError:
+        raise unauthorized("Invalid token")
+    
+    _payload_cache[token] = payload
+    return payload
 
 
 def verify_token_type(payload: Dict[str, Any], expected_type: str) -> None:
@@ -94,9 +133,5 @@ def verify_token_type(payload: Dict[str, Any], expected_type: str) -> None:
         HTTPException: If token is not of the expected type
     """
     if payload.get("type") != expected_type:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token type. Expected {expected_type} token.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized(f"Invalid token type. Expected {expected_type} token.")
 
@@ -2,7 +2,7 @@
 Pydantic models for request and response validation.
 """
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class UserBase(BaseModel):
@@ -15,7 +15,7 @@ class UserBase(BaseModel):
 class UserInDB(UserBase):
     """User model as stored in the mock database."""
     id: str
-    password: str
+    hashed_password: str
 
 
 class User(UserBase):
@@ -25,6 +25,9 @@ class User(UserBase):
 
 class UserLogin(BaseModel):
     """Model for login request validation."""
+    # Request bodies are read-only once parsed; unknown keys are dropped
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     username: str
     password: str
 
@@ -45,5 +48,7 @@ class TokenPayload(BaseModel):
 
 class RefreshToken(BaseModel):
     """Model for refresh token request validation."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     refresh_token: str
 
@@ -1,7 +1,12 @@
 """
 API routes for authentication and user endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import time
+from functools import lru_cache
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from auth.models import User, UserLogin, Token, RefreshToken
@@ -11,7 +16,7 @@ from auth.service import (
     refresh_tokens,
     get_user_by_id
 )
-from auth.jwt_helper import decode_token, verify_token_type
+from auth.jwt_helper import decode_token, unauthorized, verify_token_type
 
 # Create router
 router = APIRouter()
@@ -19,11 +24,17 @@ router = APIRouter()
 # HTTP Bearer scheme for token authentication
 security = HTTPBearer()
 
+# Users resolved from access tokens, with the token's expiry, keyed by token
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """
     Dependency to get the current authenticated user.
     
+    The user resolved for a token is cached briefly, so repeated requests
+    with the same token skip decoding and the user lookup.
+    
     Args:
         credentials: HTTP Bearer credentials containing the JWT token
         
@@ -36,6 +47,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     # Extract token from credentials
     token = credentials.credentials
     
+    # Reuse the user already resolved for this token until it expires
+    cached = _user_cache.get(token)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > time.time():
+            return user
+        _user_cache.pop(token, None)
+    
     # Decode and validate the token
     payload = decode_token(token)
     
@@ -45,29 +64,25 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     # Get user ID from token
     user_id = payload.get("sub")
     if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Invalid token")
     
     # Get user from database
     user = get_user_by_id(user_id)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("User not found")
     
+    _user_cache[token] = (user, payload["exp"])
     return user
 
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin):
+def login(user_data: UserLogin):
     """
     Authenticate user and return access and refresh tokens.
     
+    Declared sync so FastAPI runs the bcrypt check in its threadpool
+    instead of blocking the event loop.
+    
     Args:
         user_data: User login data (JSON format)
         
@@ -78,9 +93,7 @@ async def login(user_data: UserLogin):
     user = authenticate_user(user_data.username, user_data.password)
     
     # Create tokens
-    tokens = create_tokens_for_user(user.id)
-    
-    return Token(**tokens)
+    return create_tokens_for_user(user.id)
 
 
 @router.post("/refresh-token", response_model=Token)
@@ -95,9 +108,24 @@ async def refresh_token(refresh_token_data: RefreshToken):
         Token object with new access_token, refresh_token, and token_type
     """
     # Refresh tokens
-    tokens = refresh_tokens(refresh_token_data.refresh_token)
+    return refresh_tokens(refresh_token_data.refresh_token)
+
+
+@lru_cache(maxsize=4096)
+def _serialize_user(user_id: str) -> bytes:
+    """
+    Serialize a user's /me response body.
     
-    return Token(**tokens)
+    Users in the mock database never change, so bodies are cached per user
+    for the life of the process.
+    
+    Args:
+        user_id: ID of an existing user
+        
+    Returns:
+        JSON-encoded user details
+    """
+    return orjson.dumps(get_user_by_id(user_id).model_dump())
 
 
 @router.get("/me", response_model=User)
@@ -109,6 +137,6 @@ async def get_me(current_user: User = Depends(get_current_user)):
         current_user: Current authenticated user (from dependency)
         
     Returns:
-        User object with user details
+        Pre-serialized JSON response with user details
     """
-    return current_user
+    return Response(content=_serialize_user(current_user.id), media_type="application/json")
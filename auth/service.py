@@ -1,14 +1,17 @@
 """
 User and token service logic.
 """
+import sys
 from typing import Optional, Dict, List, Any
-from fastapi import HTTPException, status
 
-from auth.models import User, UserInDB
+import bcrypt
+
+from auth.models import Token, User, UserInDB
 from auth.jwt_helper import (
     create_access_token,
     create_refresh_token,
     decode_token,
+    unauthorized,
     verify_token_type
 )
 from config import TOKEN_TYPE
@@ -31,6 +34,66 @@ USERS_DB = [
     }
 ]
 
+# bcrypt work factor for stored password hashes
+_BCRYPT_ROUNDS = 12
+
+# bcrypt only uses the first 72 bytes of a password
+_BCRYPT_MAX_PASSWORD_BYTES = 72
+
+
+def _encode_password(password: str) -> bytes:
+    """
+    Encode a password for bcrypt.
+    
+    Args:
+        password: Plain-text password
+        
+    Returns:
+        UTF-8 bytes of the password, truncated to bcrypt's 72-byte limit
+    """
+    return password.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES]
+
+
+def _hash_password(password: str) -> str:
+    """
+    Hash a password with bcrypt.
+    
+    Args:
+        password: Plain-text password
+        
+    Returns:
+        bcrypt hash of the password
+    """
+    salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_encode_password(password), salt).decode("ascii")
+
+
+# Models for every user in USERS_DB, validated once and indexed for lookups;
+# plain-text passwords are replaced by their hashes. Keys are interned so
+# they are shared with any other interned copy of the same string.
+_USERINDB_BY_USERNAME: Dict[str, UserInDB] = {
+    sys.intern(user["username"]): UserInDB(
+        id=user["id"],
+        username=user["username"],
+        email=user["email"],
+        role=user["role"],
+        hashed_password=_hash_password(user["password"])
+    )
+    for user in USERS_DB
+}
+_USER_BY_ID: Dict[str, User] = {
+    sys.intern(user["id"]): User(
+        id=user["id"],
+        username=user["username"],
+        email=user["email"],
+        role=user["role"]
+    )
+    for user in USERS_DB
+}
+
+# Hash checked for unknown usernames so failed logins take the same time
+_DUMMY_PASSWORD_HASH = _hash_password("dummy-password")
+
 
 def get_user_by_username(username: str) -> Optional[UserInDB]:
     """
@@ -42,10 +105,7 @@ def get_user_by_username(username: str) -> Optional[UserInDB]:
     Returns:
         User object if found, None otherwise
     """
-    for user_data in USERS_DB:
-        if user_data["username"] == username:
-            return UserInDB(**user_data)
-    return None
+    return _USERINDB_BY_USERNAME.get(username)
 
 
 def get_user_by_id(user_id: str) -> Optional[User]:
@@ -58,16 +118,7 @@ def get_user_by_id(user_id: str) -> Optional[User]:
     Returns:
         User object if found, None otherwise
     """
-    for user_data in USERS_DB:
-        if user_data["id"] == user_id:
-            # Return User model (without password)
-            return User(
-                id=user_data["id"],
-                username=user_data["username"],
-                email=user_data["email"],
-                role=user_data["role"]
-            )
-    return None
+    return _USER_BY_ID.get(user_id)
 
 
 def authenticate_user(username: str, password: str) -> UserInDB:
@@ -86,26 +137,20 @@ def authenticate_user(username: str, password: str) -> UserInDB:
     """
     user = get_user_by_username(username)
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    # Always run one bcrypt check, even for unknown usernames, so response
+    # timing does not reveal which usernames exist
+    hashed_password = user.hashed_password if user else _DUMMY_PASSWORD_HASH
+    password_ok = bcrypt.checkpw(
+        _encode_password(password), hashed_password.encode("ascii")
+    )
     
-    # In a real application, you would use password hashing
-    # For example: if not verify_password(password, user.password):
-    if password != user.password:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not user or not password_ok:
+        raise unauthorized("Invalid username or password")
     
     return user
 
 
-def create_tokens_for_user(user_id: str) -> Dict[str, str]:
+def create_tokens_for_user(user_id: str) -> Token:
     """
     Create access and refresh tokens for a user.
     
@@ -113,23 +158,20 @@ def create_tokens_for_user(user_id: str) -> Dict[str, str]:
         user_id: User ID to create tokens for
         
     Returns:
-        Dictionary containing access_token, refresh_token, and token_type
+        Token object with access_token, refresh_token, and token_type
     """
     # Create token data
     token_data = {"sub": user_id}
     
-    # Create tokens
-    access_token = create_access_token(token_data)
-    refresh_token = create_refresh_token(token_data)
-    
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": TOKEN_TYPE
-    }
+    # Build the response model directly; the values need no validation
+    return Token.model_construct(
+        access_token=create_access_token(token_data),
+        refresh_token=create_refresh_token(token_data),
+        token_type=TOKEN_TYPE
+    )
 
 
-def refresh_tokens(refresh_token: str) -> Dict[str, str]:
+def refresh_tokens(refresh_token: str) -> Token:
     """
     Refresh access and refresh tokens using a valid refresh token.
     
@@ -137,7 +179,7 @@ def refresh_tokens(refresh_token: str) -> Dict[str, str]:
         refresh_token: Valid refresh token
         
     Returns:
-        Dictionary containing new access_token, refresh_token, and token_type
+        Token object with new access_token, refresh_token, and token_type
         
     Raises:
         HTTPException: If refresh token is invalid
@@ -151,20 +193,12 @@ def refresh_tokens(refresh_token: str) -> Dict[str, str]:
     # Get user ID from token
     user_id = payload.get("sub")
     if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("Invalid token")
     
     # Check if user exists
     user = get_user_by_id(user_id)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise unauthorized("User not found")
     
     # Create new tokens
     return create_tokens_for_user(user_id)
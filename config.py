@@ -2,10 +2,15 @@
 Configuration settings for the FastAPI application.
 Contains JWT token settings and secrets.
 """
+import os
 from datetime import timedelta
 
 # JWT Settings
-SECRET_KEY = "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"  # In production, use a secure random key
+SECRET_KEY = os.environ.get(
+    "SECRET_KEY",
+    "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"  # In production, set SECRET_KEY
+)
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")  # Encoded once for JWT signing
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 hour
 REFRESH_TOKEN_EXPIRE_DAYS = 7  # 7 days
@@ -13,6 +18,23 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7  # 7 days
 # Convert refresh token expiry to minutes for consistency
 REFRESH_TOKEN_EXPIRE_MINUTES = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60
 
+# Token lifetimes as timedelta objects, reused for every token
+ACCESS_TOKEN_EXPIRE = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_EXPIRE = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
 # Token type
 TOKEN_TYPE = "bearer"
 
+# Worker threads shared by sync endpoints, streamed scan bodies, ZIP listing and
+# upload I/O; never fewer than anyio's default of 40
+THREADPOOL_SIZE = max(40, int(os.environ.get("THREADPOOL_SIZE", "40")))
+
+# CORS Settings
+ENABLE_CORS = os.environ.get("ENABLE_CORS", "1") == "1"
+CORS_ORIGIN_REGEX = os.environ.get("CORS_ORIGIN_REGEX", ".*")  # In production, restrict to your domains
+CORS_ALLOW_HEADERS = ["Authorization", "Content-Type"]
+CORS_MAX_AGE = 86400  # Let browsers cache preflight responses for a day
+
+# Server Settings (used when running main.py directly)
+UVICORN_RELOAD = os.environ.get("UVICORN_RELOAD", "0") == "1"  # Enable only for local development
+UVICORN_WORKERS = int(os.environ.get("UVICORN_WORKERS", "1"))
@@ -4,13 +4,42 @@ FastAPI Security Testing API
 This is the main entry point for the FastAPI application.
 It sets up the API with security testing endpoints and JWT authentication.
 """
+from contextlib import asynccontextmanager
+
+import orjson
 import uvicorn
-from fastapi import FastAPI
+from anyio import to_thread
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 
 from auth.routes import router as auth_router
 from app.api.v1.security import router as security_router
+from config import (
+    CORS_ALLOW_HEADERS,
+    CORS_MAX_AGE,
+    CORS_ORIGIN_REGEX,
+    ENABLE_CORS,
+    THREADPOOL_SIZE,
+    UVICORN_RELOAD,
+    UVICORN_WORKERS
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+    
+    Sizes the shared worker thread pool and builds the OpenAPI schema
+    before serving requests.
+    """
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # app.openapi() caches its result, so the first /openapi.json request
+    # no longer pays for schema generation
+    app.openapi()
+    yield
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -19,22 +48,42 @@ app = FastAPI(
     version="1.0.0",
     docs_url=None,  # Disable default docs URL
     redoc_url=None,  # Disable default redoc URL
+    lifespan=lifespan,
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify the allowed origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Add CORS middleware only when browser clients on other origins need it
+if ENABLE_CORS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origin_regex=CORS_ORIGIN_REGEX,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=CORS_ALLOW_HEADERS,
+        max_age=CORS_MAX_AGE,
+    )
 
 # Include routers
 app.include_router(auth_router, tags=["auth"])
 app.include_router(security_router, tags=["security"])
 
 
+# Swagger UI page and root body never change while the app runs, so they are
+# rendered once here instead of on every request
+_DOCS_HTML = get_swagger_ui_html(
+    openapi_url=app.openapi_url,
+    title=f"{app.title} - API Documentation",
+    swagger_js_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js",
+    swagger_css_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css",
+).body
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to Security Testing API",
+    "docs_url": "/docs",
+    "endpoints": {
+        "security_testing": "/api/v1/security-testing"
+    }
+})
+
+
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
     """
@@ -43,12 +92,7 @@ async def custom_swagger_ui_html():
     Returns:
         Swagger UI HTML
     """
-    return get_swagger_ui_html(
-        openapi_url=app.openapi_url,
-        title=f"{app.title} - API Documentation",
-        swagger_js_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js",
-        swagger_css_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css",
-    )
+    return Response(content=_DOCS_HTML, media_type="text/html")
 
 
 @app.get("/", tags=["root"])
@@ -59,15 +103,15 @@ async def root():
     Returns:
         Dictionary with a welcome message
     """
-    return {
-        "message": "Welcome to Security Testing API",
-        "docs_url": "/docs",
-        "endpoints": {
-            "security_testing": "/api/v1/security-testing"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
     # Run the application with uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=UVICORN_RELOAD,
+        workers=UVICORN_WORKERS,
+    )
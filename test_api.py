@@ -3,54 +3,46 @@ Test script for the Security Testing API.
 
 This script tests the API endpoints by making requests to the running server.
 """
-import os
-import json
+import io
 import zipfile
-import tempfile
+import orjson
 import requests
 from datetime import datetime
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# Shared session so all requests reuse pooled keep-alive connections
+_SESSION = requests.Session()
+
 def test_security_testing_endpoint():
     """Test the security testing endpoint with a sample ZIP file."""
     print("\n=== Testing Security Testing Endpoint ===")
     
-    # Create a temporary ZIP file with sample content
-    with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as temp_file:
-        temp_zip_path = temp_file.name
-    
-    try:
-        # Create a ZIP file with sample files
-        with zipfile.ZipFile(temp_zip_path, 'w') as zip_file:
-            # Add a Python file
-            zip_file.writestr('main.py', 'print("Hello, World!")\n# TODO: Remove hardcoded password\npassword = "secret123"')
-            
-            # Add a JSON file
-            zip_file.writestr('config.json', '{"api_key": "1234567890", "debug": true}')
-            
-            # Add a JavaScript file
-            zip_file.writestr('app.js', 'console.log("Hello, World!");')
+    # Build the sample ZIP in memory; nothing touches the filesystem
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        # Add a Python file
+        zip_file.writestr('main.py', 'print("Hello, World!")\n# TODO: Remove hardcoded password\npassword = "secret123"')
         
-        # Make request to security testing endpoint
-        with open(temp_zip_path, 'rb') as zip_file:
-            files = {'file': ('test.zip', zip_file, 'application/zip')}
-            response = requests.post(f"{BASE_URL}/api/v1/security-testing", files=files)
+        # Add a JSON file
+        zip_file.writestr('config.json', '{"api_key": "1234567890", "debug": true}')
         
-        # Print response status and data
-        print(f"Status Code: {response.status_code}")
-        if response.status_code == 200:
-            data = response.json()
-            print(json.dumps(data, indent=2))
-            print("✅ Security testing endpoint test passed!")
-        else:
-            print(f"❌ Error: {response.text}")
+        # Add a JavaScript file
+        zip_file.writestr('app.js', 'console.log("Hello, World!");')
+    
+    # Make request to security testing endpoint
+    files = {'file': ('test.zip', zip_buffer.getvalue(), 'application/zip')}
+    response = _SESSION.post(f"{BASE_URL}/api/v1/security-testing", files=files)
     
-    finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_zip_path):
-            os.unlink(temp_zip_path)
+    # Print response status and data
+    print(f"Status Code: {response.status_code}")
+    if response.status_code == 200:
+        data = orjson.loads(response.content)
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+        print("✅ Security testing endpoint test passed!")
+    else:
+        print(f"❌ Error: {response.text}")
 
 
 def main():
@@ -60,7 +52,7 @@ def main():
     
     try:
         # Test root endpoint to check if server is running
-        response = requests.get(BASE_URL)
+        response = _SESSION.get(BASE_URL)
         if response.status_code == 200:
             print(f"✅ Server is running! Response: {response.json()}")
         else:
@@ -0,0 +1,138 @@
+"""
+Comparison checks for the ZIP entry listing used by the security testing endpoint.
+
+Every archive is listed both by list_zip_files and by zipfile.namelist(), and the
+two results must match. Run directly or with pytest.
+"""
+import io
+import struct
+import zipfile
+
+from app.services.security_service import list_zip_files
+
+# ZIP64 end of central directory record and locator (PKWARE APPNOTE 4.3.14-15)
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_EOCD = struct.Struct("<4s4H2LH")
+
+
+def _build_zip(names, comment=b""):
+    """Build an in-memory ZIP archive with one short entry per name."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        for name in names:
+            zip_file.writestr(name, "" if name.endswith("/") else "x")
+        zip_file.comment = comment
+    return buffer.getvalue()
+
+
+def _expected_names(data):
+    """List non-directory entries the way zipfile does."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        return [name for name in zip_file.namelist() if not name.endswith("/")]
+
+
+def _assert_matches_zipfile(data):
+    """Check that list_zip_files agrees with zipfile for an archive."""
+    expected = _expected_names(data)
+    assert list_zip_files(io.BytesIO(data)) == expected
+    return expected
+
+
+def test_plain_archive():
+    """A plain archive with files and a directory entry."""
+    names = _assert_matches_zipfile(_build_zip(["main.py", "src/", "src/app.js"]))
+    assert names == ["main.py", "src/app.js"]
+
+
+def test_empty_archive():
+    """An archive with no entries."""
+    assert _assert_matches_zipfile(_build_zip([])) == []
+
+
+def test_archive_comment():
+    """An archive comment follows the end record."""
+    _assert_matches_zipfile(_build_zip(["a.txt"], comment=b"build 42"))
+
+
+def test_comment_containing_end_signature():
+    """An end-record signature inside the comment is not mistaken for the record."""
+    data = _build_zip(["a.txt", "b.txt"], comment=b"see PK\x05\x06 marker in the release notes")
+
+    # zipfile itself rejects this archive; the entries are still listed
+    try:
+        _expected_names(data)
+    except zipfile.BadZipFile:
+        pass
+    assert list_zip_files(io.BytesIO(data)) == ["a.txt", "b.txt"]
+
+
+def test_trailing_bytes():
+    """Bytes appended after the end record, as some tools add."""
+    data = _build_zip(["a.txt", "b.txt"])
+    _assert_matches_zipfile(data + b"\n")
+    _assert_matches_zipfile(data + b"\x00" * 16)
+    _assert_matches_zipfile(_build_zip(["a.txt"], comment=b"note") + b"\n")
+
+
+def test_prepended_data():
+    """Data in front of the archive, as in self-extracting ZIPs."""
+    data = b"MZ" + b"\x00" * 510 + _build_zip(["a.py", "b.js"])
+    assert _assert_matches_zipfile(data) == ["a.py", "b.js"]
+
+
+def test_not_a_zip():
+    """Files that are not ZIP archives are rejected."""
+    for data in (b"", b"hello", b"PK\x03\x04" + b"garbage" * 10):
+        try:
+            list_zip_files(io.BytesIO(data))
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {data!r}")
+
+
+def test_forced_zip64_records():
+    """A ZIP64 end record and locator written even though the values fit."""
+    data = _build_zip(["a.txt", "b.txt"])
+    _, _, _, _, count, size, offset, _ = _EOCD.unpack_from(data, len(data) - _EOCD.size)
+    record_offset = offset + size
+    zip64 = _ZIP64_EOCD.pack(b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, size, offset)
+    locator = _ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, record_offset, 1)
+
+    data = data[:record_offset] + zip64 + locator + data[record_offset:]
+    assert _assert_matches_zipfile(data) == ["a.txt", "b.txt"]
+
+
+def test_more_than_65535_entries():
+    """Archives past the 16-bit entry count use real ZIP64 records."""
+    names = [f"f{i}" for i in range(0x10000 + 1)]
+    assert _assert_matches_zipfile(_build_zip(names)) == names
+
+
+def test_name_encodings():
+    """UTF-8 flagged names and legacy CP437 names."""
+    _assert_matches_zipfile(_build_zip(["café.py", "文件.js"]))
+
+    # zipfile always writes non-ASCII names as UTF-8, so patch in CP437 bytes
+    data = _build_zip(["cafX.txt"]).replace(b"cafX.txt", "café.txt".encode("cp437"))
+    assert _assert_matches_zipfile(data) == ["café.txt"]
+
+
+def test_name_with_nul_byte():
+    """Names are cut at the first NUL byte, as zipfile does."""
+    data = _build_zip(["abcXdef.py"]).replace(b"abcXdef.py", b"abc\x00def.py")
+    assert _assert_matches_zipfile(data) == ["abc"]
+
+
+def main():
+    """Run all checks."""
+    for name, check in list(globals().items()):
+        if name.startswith("test_") and callable(check):
+            check()
+            print(f"✅ {name}")
+
+    print("\n✅ All ZIP listing checks passed!")
+
+
+if __name__ == "__main__":
+    main()